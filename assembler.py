@@ -4,7 +4,8 @@ from machine import *
 
 
 space_replace = "冇"
-instruction_aliases = json.load(open("aliases.json"))
+arg_separator = re.compile(r", *| +")
+instruction_aliases = load_json("aliases.json")
 
 
 class CherrySyntaxError(SyntaxError):
@@ -12,6 +13,8 @@ class CherrySyntaxError(SyntaxError):
 
 
 class Argument:
+    __slots__ = ("type", "value", "lit_size")
+
     def __init__(self, arg_type: str, value: int | str, **kwargs):
         self.type = arg_type
         self.value = value
@@ -57,8 +60,13 @@ class Assembler:
             k.split("-")[0]: len(v.asm_args)  # each asm mnemonic has exactly one expected arg count
             for k, v in self.mnemonics.items() if "-" in k
         }
-        self.register_pointers = {g["pointer"]: Register.from_json(g) for g in registers}
-        self.register_names = {g["name"]: Register.from_json(g) for g in registers}
+        self.stack_mnemonics = {  # (mnemonic, arg type, operand size) -> instruction, for PUSH and POP only
+            (k.split("-")[0], arg_type, 4 if k[-1] == "W" else 1): v
+            for k, v in self.mnemonics.items() if k.split("-")[0] in ("PUSH", "POP")
+            for arg_type in v.asm_args[0]
+        }
+        self.register_pointers = register_pointers
+        self.register_names = register_names
         self.line_counter = 0
         self.current_bytecode_length = 0
         self.named_references = {}
@@ -300,7 +308,12 @@ class Assembler:
         else:
             force_size = 0
 
-        raw_args = re.split(r", *| +", s) if s else []
+        if not s:
+            raw_args = []
+        elif "," not in s:  # space-separated (or single) arguments don't need the regex
+            raw_args = [g for g in s.split(" ") if g]
+        else:
+            raw_args = arg_separator.split(s)
         correct_arg_count = self.arg_count(mnemonic)
         if len(raw_args) != correct_arg_count:
             raise CherrySyntaxError(f"{mnemonic} expected {correct_arg_count} arguments and got {len(raw_args)} "
@@ -316,14 +329,14 @@ class Assembler:
 
         if mnemonic == "PUSH":
             size = force_size if force_size else args[0].size
-            opcode = self.mnemonics[f"{mnemonic}-{args[0].type[0].upper()}{'W' if size == 4 else 'B'}"].code
+            opcode = self.stack_mnemonics[mnemonic, args[0].type, 4 if size == 4 else 1].code
             op_add = self.assemble_op_add(args[0])
             if args[0].type == "lit" and args[0].value != 0:
                 givens = bytes(args[0])
 
         elif mnemonic == "POP":
             size = force_size if force_size else args[0].size
-            opcode = self.mnemonics[f"{mnemonic}-{'W' if size == 4 else 'B'}"].code
+            opcode = self.stack_mnemonics[mnemonic, args[0].type, 4 if size == 4 else 1].code
             op_add = self.assemble_op_add(args[0])
 
         elif mnemonic in ("MOV", "ADD", "SUB", "CMP", "AND", "OR", "XOR"):  # standard op-add commands
@@ -437,11 +450,10 @@ class Assembler:
 
         # writing
         temp_path = f"tmp{int(time())}.chy"
-        open(temp_path, "w")  # clear temp file if it already exists (for whatever reason)
         byte_buffer = bytearray([])
         try:
-            with open(source_path, encoding="utf8") as src, open(temp_path, "at" if mode == "s" else "ab") as dest:
-                for line in src.readlines():
+            with open(source_path, encoding="utf8") as src, open(temp_path, "wt" if mode == "s" else "wb") as dest:
+                for line in src:
                     instruction = self.assemble_instruction(line)
                     if instruction:
                         if mode == "s":
@@ -1,18 +1,29 @@
 import json
 import re
+from collections import namedtuple
 from math import ceil
 
 
+Operand = namedtuple("Operand", "type bytes")
+
+
 class Instruction:
+    __slots__ = ("code", "mnemonic", "operands", "asm_args", "_arg_bytes")
+
     def __init__(self, code: int, mnemonic: str, operands: list[dict], asm_args: list[list[str]]):
         self.code = code
         self.mnemonic = mnemonic
-        self.operands = operands
-        self.asm_args = asm_args
+        self.operands = tuple(Operand(**g) for g in operands)
+        self.asm_args = tuple(tuple(g) for g in asm_args)
+        self._arg_bytes = sum(g.bytes for g in self.operands)
+
+    @property
+    def arg_bytes(self) -> int:
+        return self._arg_bytes
 
     @property
     def base_length(self) -> int:
-        return 1 + sum(g["bytes"] for g in self.operands)
+        return 1 + self._arg_bytes
 
     @staticmethod
     def from_json(js: dict):
@@ -22,8 +33,15 @@ class Instruction:
         return bytes([self.code])
 
 
-instructions = json.load(open("instructions.json"))
-opcodes = {g["code"]: Instruction.from_json(g) for g in instructions}
+def load_json(path: str):
+    with open(path) as fp:
+        return json.load(fp)
+
+
+instructions = load_json("instructions.json")
+opcodes = {g["code"]: Instruction(g["code"], g["mnemonic"], g["operands"], g["asm_args"]) for g in instructions}
+opcode_table: list[Instruction | None] = [opcodes.get(g) for g in range(256)]  # indexed directly by opcode byte
+mnemonic_table: list[str] = [g.mnemonic if g else "NOP" for g in opcode_table]
 
 
 class BitError(ValueError):
@@ -31,17 +49,23 @@ class BitError(ValueError):
 
 
 SupportsBitConversion = int | str | list[int] | bytes
+bit_digits = bytes.maketrans(b"\x00\x01", b"01")  # maps a list of bits to the ASCII digits int() expects
+digit_bits = bytes.maketrans(b"01", b"\x00\x01")  # and back again
 
 
 def zero_pad(ls: list, length: int, zero=0):
     return ls[:length] + [zero for _ in range(len(ls), length)]
 
 
+def signed_value(value: int, bit_size: int) -> int:
+    """Reinterprets an unsigned integer of the given bit width as two's complement."""
+    return value - (1 << bit_size if value >> (bit_size - 1) & 1 else 0)
+
+
 def convert_to_bits(data: SupportsBitConversion, length: int = 8) -> list[int]:
     if isinstance(data, int):
-        if data < 0:
-            data += 2 ** length
-        return [int(g) for g in f"{data:b}".rjust(length, "0")[:-(length+1):-1]]
+        # formatting and translating in C beats shifting out each bit in Python
+        return list(f"{data & ((1 << length) - 1):0{length}b}".encode()[::-1][:length].translate(digit_bits))
     elif isinstance(data, str):
         if re.fullmatch(r"[01]{8}( +[01]{8})*", data):
             return zero_pad([int(j) for g in data.split() for j in g[::-1]], length)
@@ -61,7 +85,21 @@ def convert_to_bits(data: SupportsBitConversion, length: int = 8) -> list[int]:
         return [j for g in list(data) for j in convert_to_bits(g)]
 
 
+def convert_to_bytes(data: SupportsBitConversion, length: int = 1) -> bytes:
+    """Converts data into exactly the given number of little-endian bytes, truncating or zero-padding as needed."""
+    if isinstance(data, Byte):
+        data = data.value
+    if isinstance(data, int):
+        return (data & ((1 << (length * 8)) - 1)).to_bytes(length, "little")
+    elif isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data[:length]).ljust(length, b"\x00")
+    bits = zero_pad(convert_to_bits(data, length * 8), length * 8)
+    return int(bytes(bits[::-1]).translate(bit_digits), 2).to_bytes(length, "little")
+
+
 class Byte:  # not a fan of the built-in binary classes
+    __slots__ = ("size", "bits")
+
     def __init__(self, data: SupportsBitConversion = 0, size: int = 8):
         self.size = size
         self.bits = convert_to_bits(data, length=self.size)
@@ -84,19 +122,18 @@ class Byte:  # not a fan of the built-in binary classes
 
     @property
     def value(self):
-        return int("".join(str(g) for g in self.bits.__reversed__()), 2)
+        return int(bytes(self.bits[::-1]).translate(bit_digits), 2)
 
     @property
     def mnemonic(self) -> str:
-        if self.value in opcodes:
-            return opcodes[self.value].mnemonic
-        return "NOP"
+        value = self.value
+        return mnemonic_table[value] if value < 256 else "NOP"
 
     def __len__(self):
         return len(self.bits)
 
     def __neg__(self):
-        return self.__class__(data=[[1, 0][g] for g in self.bits], size=self.size)
+        return self.__class__(data=self.value ^ ((1 << len(self.bits)) - 1), size=self.size)
 
     def __and__(self, other):
         return self.__class__(data=self.value & other.value, size=self.size)
@@ -149,14 +186,15 @@ class Byte:  # not a fan of the built-in binary classes
         self.bits[index] = int(not self.bits[index])
 
     def signed_int(self):
-        return int("".join(str(g) for g in self.bits.__reversed__()), 2) - \
-            (2 ** self.size if self.bits[-1] else 0)
+        return signed_value(self.value, len(self.bits))
 
     def ascii(self):
         return chr(self.value)
 
 
 class ByteArray(Byte):
+    __slots__ = ()
+
     def __init__(self, size: int, data: SupportsBitConversion = 0):
         super().__init__(size=size*8, data=data)
         self.size = size
@@ -175,39 +213,61 @@ class ByteArray(Byte):
     def from_bits(ls: list[int]):
         return ByteArray(data=ls, size=ceil(len(ls) / 8))
 
+    @staticmethod
+    def from_buffer(bts: bytes | bytearray | memoryview):
+        """Builds a ByteArray straight from little-endian bytes, skipping the general-purpose conversion."""
+        ret = ByteArray.__new__(ByteArray)
+        ret.size = len(bts)
+        ret.bits = convert_to_bits(int.from_bytes(bts, "little"), ret.size * 8)
+        return ret
+
+    def byte_at(self, index: int) -> Byte:
+        """Same as self[index] for an in-range, non-negative index, without the checks."""
+        ret = Byte.__new__(Byte)
+        ret.size = 8
+        ret.bits = self.bits[index*8:index*8+8]
+        return ret
+
     @property
     def bytes(self) -> list[Byte]:
-        return [Byte(self.bits[g*8:g*8+8]) for g in range(self.size)]
+        value = self.value
+        return [Byte((value >> (g * 8)) & 255) for g in range(self.size)]
 
     @property
     def hex(self):
-        return " ".join(g.hex for g in self.bytes)
+        return bytes(self).hex(" ").upper()
 
     @property
     def opcode(self):
-        return self.bytes[0].value
+        return self[0].value
 
     @property
     def mnemonic(self) -> str:
-        return self.bytes[0].mnemonic
+        return self[0].mnemonic
 
     def __str__(self):
         return " ".join(str(g) for g in self.bytes)
 
     def __getitem__(self, item):  # -> Byte | ByteArray
         if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step == 1:  # contiguous slices can be cut straight out of the bit list
+                ret = ByteArray.__new__(ByteArray)
+                ret.size = max(start, stop) - start
+                ret.bits = self.bits[start*8:max(start, stop)*8]
+                return ret
             return ByteArray.from_bits([j for g in self.bytes[item] for j in g.bits])
-        return self.bytes[item]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("ByteArray index out of range")
+        return self.byte_at(item)
 
     def __bytes__(self):
-        return bytes([g.value for g in self.bytes])
+        return self.value.to_bytes(self.size, "little")
 
     def __len__(self):
         return len(self.bits) // 8
 
-    def signed_int(self):
-        return int("".join(str(g) for g in self.bits.__reversed__()), 2) - \
-            (2 ** (self.size * 8) if self.bits[-1] else 0)
-
     def ascii(self):
         return "".join(g.ascii() for g in self.bytes)
@@ -1,3 +1,4 @@
+from operator import and_, or_, xor
 from sys import stdout
 from bytes import *
 
@@ -9,33 +10,49 @@ class OpcodeError(ValueError):
     pass
 
 
+class InvalidOpAdd:
+    """Fills op-add table slots with no matching register. Unpacking one raises the decoding error."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __iter__(self):
+        raise OpcodeError(self.message)
+
+
 class Register:
     def __init__(self, size: int, data: SupportsBitConversion | Byte = 0, children: dict[str, int] = (), **kwargs):
         self.size = size
-        self.bits = convert_to_bits(data, length=self.size * 8)
+        self.data = bytearray(convert_to_bytes(data, self.size))  # little-endian, one element per byte
         self.children = dict(children)
         self.name = kwargs.get("name")
         self.pointer = kwargs.get("pointer", 0)
         self.op_add = kwargs.get("op_add", -1)
 
+    @property
+    def bits(self) -> list[int]:  # only built when bit-level access is actually needed
+        return convert_to_bits(bytes(self.data))
+
     @property
     def bytes(self):
-        return ByteArray(self.size, self.bits)
+        return ByteArray.from_buffer(self.data)
 
     @property
     def value(self):
-        return self.bytes.value
+        return int.from_bytes(self.data, "little")
 
     @property
     def hex(self):
-        return self.bytes.hex
+        return self.data.hex(" ").upper()
 
     @staticmethod
     def from_json(js: dict):
         return Register(**js)
 
     def __getitem__(self, item) -> Byte | ByteArray:
-        return self.bytes[item]
+        if isinstance(item, slice):
+            return ByteArray.from_buffer(self.data[item])
+        return Byte(self.data[item])
 
     def __setitem__(self, key, value):
         self.bytes[key] = value
@@ -44,7 +61,12 @@ class Register:
         return str(self.bytes)
 
     def write(self, data: SupportsBitConversion | Byte):
-        self.bits = convert_to_bits(data, length=self.size * 8)
+        if isinstance(data, int):  # the common cases skip the general conversion
+            self.data[:] = (data & ((1 << (self.size * 8)) - 1)).to_bytes(self.size, "little")
+        elif isinstance(data, (bytes, bytearray, memoryview)) and len(data) == self.size:
+            self.data[:] = data
+        else:
+            self.data[:] = convert_to_bytes(data, self.size)
 
     def write_at(self, address: int | ByteArray, data: SupportsBitConversion | Byte, no_bytes: int = 1):
         if isinstance(address, ByteArray):
@@ -53,25 +75,127 @@ class Register:
             no_bytes = len(data)
         elif not no_bytes:
             raise ValueError("Must specify the number of bytes to write non-ByteArray objects to registers.")
-        self.bits[address*8:(address+no_bytes)*8] = convert_to_bits(data, no_bytes * 8)
-        if address + no_bytes > self.size:
-            del self.bits[self.size*8:]
+        if not (isinstance(data, (bytes, bytearray, memoryview)) and len(data) == no_bytes):
+            data = convert_to_bytes(data, no_bytes)  # anything already the right shape is copied as-is
+        self.write_bytes(address, data)
+
+    def write_bytes(self, address: int, bts: bytes):
+        # anything past the end of the register is dropped
+        self.data[address:address + len(bts)] = bts[:max(0, self.size - address)]
 
 
-registers = json.load(open("registers.json"))
-register_pointers = {g["pointer"]: Register.from_json(g) for g in registers}
+registers = load_json("registers.json")  # parsed once per process; every Machine builds its registers from this
+register_pointers = {g["pointer"]: Register.from_json(g) for g in registers}  # read-only schema, shared by assemblers
+register_names = {g.name: g for g in register_pointers.values()}
 
 
 class Drive(Register):
     def read(self, address: int | ByteArray, no_bytes: int) -> ByteArray:
         if isinstance(address, ByteArray):
             address = address.value
-        return ByteArray.from_bits(self.bits[address * 8:(address + no_bytes) * 8])
+        return ByteArray.from_buffer(self.read_bytes(address, no_bytes))
+
+    def read_int(self, address: int, no_bytes: int, signed: bool = False) -> int:
+        return int.from_bytes(self.read_bytes(address, no_bytes), "little", signed=signed)
+
+    def read_bytes(self, address: int, no_bytes: int) -> bytes:
+        # wraps around the end of memory the same way write_bytes does
+        address %= self.size
+        end = address + no_bytes
+        if end <= self.size:
+            return self.data[address:end]
+        return bytes(self.data[address:]) + bytes(self.data[:end - self.size])
+
+    def write_int(self, address: int, no_bytes: int, value: int):
+        self.write_bytes(address, (value & ((1 << (no_bytes * 8)) - 1)).to_bytes(no_bytes, "little"))
+
+    def write_bytes(self, address: int, bts: bytes):
+        # addresses wrap around the end of memory, like the 16-bit registers that hold them
+        address %= self.size
+        end = address + len(bts)
+        if end <= self.size:
+            self.data[address:end] = bts
+        else:
+            split = self.size - address
+            self.data[address:] = bts[:split]
+            self.data[:end - self.size] = bts[split:]
+
+
+DecodedOpcode = namedtuple("DecodedOpcode", "mnemonic core suffix operand_size mode base_length uses_full_op_add")
+
+
+def decode_opcode(code: int) -> DecodedOpcode:
+    """Splits an opcode byte into everything the machine needs to know about it before execution."""
+    mnemonic = mnemonic_table[code]
+    core, _, suffix = mnemonic.partition("-")
+    mode = code >> 1 & 3  # bits 1-2: op-add, lit -> indirect, lit -> memory
+    # mirrors physical implementation
+    uses_full_op_add = (mode == 0 and code >> 4 in (3, 4, 6, 7, 10)) or code >> 4 == 11
+    base_length = opcode_table[code].base_length if opcode_table[code] else None  # undefined opcodes have no length
+    return DecodedOpcode(mnemonic, core, suffix, 4 if code & 1 else 1, mode, base_length, uses_full_op_add)
+
+
+decode_table = [decode_opcode(g) for g in range(256)]
+# flat copies of the fields the fetch loop reads every step, to skip the namedtuple attribute lookups
+base_length_table = [g.base_length for g in decode_table]
+full_op_add_table = [g.uses_full_op_add for g in decode_table]
+operand_size_table = [g.operand_size for g in decode_table]
+
+
+def givens_length(op_add: int, operand_size: int) -> int:
+    """Number of bytes an op-add byte pulls in after itself (given literals and addresses)."""
+    if op_add >> 6 == 3:
+        return (0, operand_size, 0, 0, 2, 0, 0, 0)[op_add >> 3 & 7]
+    return 0
+
+
+givens_length_table = [[givens_length(g, j) for j in range(5)] for g in range(256)]  # [op-add byte][operand size]
+
+
+def encoded_length(data: bytes | bytearray, address: int = 0) -> int:
+    """Length of the instruction encoded at the given offset, using only the precomputed per-byte tables."""
+    ret = 0
+    if data[address] >> 5 == 6:  # conditionals
+        ret += 1
+    opcode = data[address + ret]
+    if base_length_table[opcode] is None:
+        raise OpcodeError(f"Undefined opcode {opcode:02X} encountered at position {address + ret}.")
+    if full_op_add_table[opcode]:
+        ret += givens_length_table[data[address + ret + 1]][operand_size_table[opcode]]
+    return ret + base_length_table[opcode]
+
+
+logic_functions = {"AND": and_, "OR": or_, "XOR": xor}
+
+
+FLAG_Z, FLAG_C, FLAG_N, FLAG_L, FLAG_H = 0, 1, 2, 6, 7  # bit positions within the FL register
+
+
+def condition_holds(mnemonic: str, z: bool, n: bool) -> bool:
+    if mnemonic in ("IFZ", "IFNZ"):
+        return z == (mnemonic == "IFZ")
+    if mnemonic in ("IFN", "IFNN"):
+        return n == (mnemonic == "IFN")
+    if mnemonic == "IFGT":
+        return not n and not z
+    if mnemonic == "IFLT":
+        return n and not z
+    if mnemonic == "IFGTE":
+        return not n or z
+    if mnemonic == "IFLTE":
+        return n or z
+    return False
+
+
+# indexed by (conditional opcode << 3 | low three bits of FL), so checking a condition needs no flag lookups
+condition_table = [
+    condition_holds(mnemonic_table[g >> 3], bool(g >> FLAG_Z & 1), bool(g >> FLAG_N & 1)) for g in range(256 << 3)
+]
 
 
 # noinspection PyTupleAssignmentBalance
 class Machine:
-    flag_names = {"Z": 0, "C": 1, "N": 2, "L": 6, "H": 7}
+    flag_names = {"Z": FLAG_Z, "C": FLAG_C, "N": FLAG_N, "L": FLAG_L, "H": FLAG_H}
     save_on_call = ["GA", "GB", "GC", "GD", "GE", "FL", "RI", "RS"]
     # registers saved to the stack when executing a CALL instruction, and retrieved on RET
     save_on_local = ["FL", "RI", "RS"]
@@ -81,103 +205,203 @@ class Machine:
         self.register_names = {g["name"]: Register.from_json(g) for g in registers}
         self.register_pointers = {g["pointer"]: g["name"] for g in registers}
         self.parent_registers = {j: g for g in self.register_names.values() for j in g.children}
+        # every register lives in one contiguous buffer, and child registers are views into their parents' bytes,
+        # so a write to any register is immediately visible in all the registers overlapping it
+        self.register_file = bytearray()
+        self.register_offsets = {}
+        for name, reg in self.register_names.items():
+            if name not in self.parent_registers:
+                self.register_offsets[name] = len(self.register_file)
+                self.register_file += reg.data
+        for name in self.register_names:
+            child, offset = name, 0
+            while parent := self.parent_registers.get(child):
+                offset += parent.children[child]
+                child = parent.name
+            self.register_offsets[name] = self.register_offsets[child] + offset
+        view = memoryview(self.register_file)
+        for name, reg in self.register_names.items():
+            reg.data = view[self.register_offsets[name]:self.register_offsets[name] + reg.size]
+        # names and pointers both resolve straight to the Register, so get_register() is a single dict lookup
+        self.register_lookup = dict(self.register_names)
+        self.register_lookup.update((k, self.register_names[v]) for k, v in self.register_pointers.items())
+        self.ip_register = self.register_names["IP"]  # touched on every step, so kept on hand rather than looked up
+        self.sp_register = self.register_names["SP"]
+        self.fl_register = self.register_names["FL"]
+        self.ri_register = self.register_names["RI"]
+        self.rs_register = self.register_names["RS"]
+        self.call_saved_registers = [self.register_names[g] for g in self.save_on_call]
+        self.local_saved_registers = [self.register_names[g] for g in self.save_on_local]
         self.memory = Drive(65536)  # just implementing memory as a continuous linear address space w/o paging
         self.operation_counter = 0
         self.halted = False
+        # address -> (length, raw bytes, decoded ByteArray) of the last instruction fetched there
+        self.instruction_cache = {}
 
-        self.op_add_registers = {}
+        self.op_add_registers = [{} for _ in range(8)]  # indexed by 3-bit op-add code, then by operand size
         for reg in self.register_names.values():
             if reg.op_add != -1:
-                self.op_add_registers[reg.op_add] = self.op_add_registers.get(reg.op_add, {}) | {reg.size: reg}
-
-    @property
-    def state_map(self):
+                self.op_add_registers[reg.op_add][reg.size] = reg
+        # [op-add byte][operand size] -> (type, special name or Register); memory operands hold the address register,
+        # which is read at execution time. combinations with no matching register hold an InvalidOpAdd
+        self.op_add_primary_table = [{} for _ in range(256)]
+        self.op_add_secondary_table = [{} for _ in range(256)]
+        for op_add in range(256):
+            for size in (1, 2, 4):
+                try:
+                    self.op_add_primary_table[op_add][size] = self.decode_op_add_primary(op_add, size)
+                except OpcodeError as e:
+                    self.op_add_primary_table[op_add][size] = InvalidOpAdd(f"Op-add byte {op_add:02X}: {e}")
+                try:
+                    self.op_add_secondary_table[op_add][size] = self.decode_op_add_secondary(op_add, size)
+                except OpcodeError as e:
+                    self.op_add_secondary_table[op_add][size] = InvalidOpAdd(f"Op-add byte {op_add:02X}: {e}")
+
+        core_handlers = {
+            "PUSH": self.execute_push, "POP": self.execute_pop, "MOV": self.execute_mov,
+            "ADD": self.execute_add, "SUB": self.execute_sub, "CMP": self.execute_compare,
+            "AND": self.execute_logic, "OR": self.execute_logic, "XOR": self.execute_logic, "NOT": self.execute_not,
+            "LSH": self.execute_shift, "RSH": self.execute_shift, "BIT": self.execute_bit,
+            "REFBIT": self.execute_refbit, "BBIT": self.execute_bbit, "BYTE": self.execute_byte,
+            "OUT": self.execute_out, "JMP": self.execute_jump, "JREL": self.execute_relative_jump,
+            "CALL": self.execute_call, "LOCAL": self.execute_call, "RET": self.execute_return, "HLT": self.execute_halt
+        }
+        self.handlers = [  # indexed by opcode byte
+            core_handlers.get(g.core, self.execute_nop) if opcode_table[n] else self.execute_undefined
+            for n, g in enumerate(decode_table)
+        ]
+
+    def state_map(self) -> str:
+        """Formats the main registers for the step-by-step trace; only called when tracing."""
         return f"  [GA] {self.get_register('GA').hex}    [IP] {self.get_register('IP').hex}\n" \
                f"  [GB] {self.get_register('GB').hex}    [SP] {self.get_register('SP').hex}\n" \
-               f"  [GC] {self.get_register('GC').hex}    [FL] {self.get_register('FL')}\n" \
+               f"  [GC] {self.get_register('GC').hex}    [FL] {self.fl_register.data[0]:08b}\n" \
                f"  [GD] {self.get_register('GD').hex}         HL---NCZ\n" \
                f"  [GE] {self.get_register('GE').hex}\n"
 
     def get_register(self, code: SupportsGetRegister) -> Register:
         if isinstance(code, Byte):
             code = code.value
-        return self.register_names[self.register_pointers.get(code, code)]
+        return self.register_lookup[code]
 
     @property
     def instruction_pointer(self):
-        return self.get_register("IP").value
+        return self.ip_register.value
 
     def read_register(self, pointer: SupportsGetRegister) -> ByteArray:
         return self.get_register(pointer).bytes
 
     def write_to_register(self, pointer: SupportsGetRegister, data: SupportsBitConversion | Byte):
-        (register := self.get_register(pointer)).write(data)
-        for k, v in register.children.items():
-            self.get_register(k).write(register.bytes[v:])
-        if parent := self.parent_registers.get(register.name):
-            self.copy_change_to_parent(register, parent)
+        self.write_register(self.get_register(pointer), data)
+
+    def write_register(self, register: Register, data: SupportsBitConversion | Byte):
+        """Writes to an already looked-up register. Its child and parent registers share its bytes, so stay in sync."""
+        register.write(data)
 
     def move_register(self, source: SupportsGetRegister, destination: SupportsGetRegister):
         self.write_to_register(destination, self.read_register(source))
 
-    def copy_change_to_parent(self, child: Register, parent: Register):
-        """When a child register is overwritten, the change is copied over to its parent via this function."""
-        parent.write_at(parent.children[child.name], child.value, child.size)
-        if grandparent := self.parent_registers.get(parent.name):
-            self.copy_change_to_parent(parent, grandparent)
-
-    def increment_reg(self, pointer: str | int | Byte, n: int = 1):
-        self.write_to_register(pointer, self.get_register(pointer).value + n)
+    def increment_reg(self, pointer: SupportsGetRegister | Register, n: int = 1):
+        register = pointer if isinstance(pointer, Register) else self.get_register(pointer)
+        self.write_register(register, register.value + n)
 
     def push(self, data: ByteArray):
-        self.increment_reg("SP", -data.size)
-        self.memory.write_at(self.get_register("SP").value, data)
+        self.increment_reg(self.sp_register, -data.size)
+        self.memory.write_at(self.sp_register.value, data)
+
+    def push_registers(self, registers: list[Register]):
+        """Pushes the given registers in order, as one block write rather than one push per register."""
+        image = b"".join(bytes(g.data) for g in reversed(registers))  # the first register pushed ends up on top
+        if self.sp_register.value < len(image):  # the stack pointer would wrap around partway through
+            for reg in registers:
+                self.push(reg.bytes)
+            return
+        self.increment_reg(self.sp_register, -len(image))
+        self.memory.write_bytes(self.sp_register.value, image)
 
     def push_all_registers(self):
-        for reg in self.save_on_call:
-            self.push(self.get_register(reg).bytes)
+        self.push_registers(self.call_saved_registers)
 
     def read_stack(self, no_bytes: int = 4) -> ByteArray:
-        return self.memory.read(self.get_register("SP").value, no_bytes)
+        return self.memory.read(self.sp_register.value, no_bytes)
 
     def pop(self, no_bytes: int = 4) -> ByteArray:
         ret = self.read_stack(no_bytes)
-        self.increment_reg("SP", no_bytes)
+        self.increment_reg(self.sp_register, no_bytes)
         return ret
 
-    def pop_all_registers(self):
-        for reg_name in self.save_on_call.__reversed__():
-            reg = self.get_register(reg_name)
-            reg.write(self.pop(reg.size))
-
-    def get_flag(self, flag: str) -> bool:
-        return bool(self.get_register("FL").bits[self.flag_names[flag]])
-
-    def set_flag(self, flag: str):
-        return self.flag_condition(flag, True)
-
-    def clear_flag(self, flag: str):
-        return self.flag_condition(flag, False)
+    def pop_registers(self, registers: list[Register]):
+        """Pops the given registers in reverse order, undoing push_registers()."""
+        registers = registers[::-1]
+        total = sum(g.size for g in registers)
+        address = self.sp_register.value
+        if address + total > len(self.memory.data):  # the stack pointer would wrap around partway through
+            for reg in registers:
+                reg.write(self.pop(reg.size))
+            return
+        image = self.memory.data[address:address + total]
+        self.increment_reg(self.sp_register, total)
+        for reg in registers:
+            reg.write(image[:reg.size])
+            image = image[reg.size:]
 
-    def flag_condition(self, flag: str, condition: bool):
-        self.get_register("FL").bits[self.flag_names[flag]] = int(condition)
+    def pop_all_registers(self):
+        self.pop_registers(self.call_saved_registers)
+
+    def get_flag(self, flag: str | int) -> bool:
+        """Flags may be given by name or by their FLAG_* bit position."""
+        if isinstance(flag, str):
+            flag = self.flag_names[flag]
+        return bool(self.fl_register.data[0] >> flag & 1)
+
+    def set_flag(self, flag: str | int):
+        if isinstance(flag, str):
+            flag = self.flag_names[flag]
+        self.fl_register.data[0] |= 1 << flag
+
+    def clear_flag(self, flag: str | int):
+        if isinstance(flag, str):
+            flag = self.flag_names[flag]
+        self.fl_register.data[0] &= ~(1 << flag)
+
+    def flag_condition(self, flag: str | int, condition: bool):
+        if isinstance(flag, str):
+            flag = self.flag_names[flag]
+        flags = self.fl_register.data
+        flags[0] = flags[0] & ~(1 << flag) | int(condition) << flag
 
     def sized_op_add_register(self, op_add_code: int, operand_size: int) -> Register:
-        return self.op_add_registers[op_add_code][operand_size]
-
-    def op_add_primary(self, op_add: Byte, operand_size: int) -> tuple[str, str | int]:
-        if op_add[6:8] == 3:
-            return "special", ("null", "given_literal", None, None, "given_address", None, None, None)[int(op_add[3:6])]
-        elif op_add[6:8] == 1:
-            return "memory", self.sized_op_add_register(int(op_add[3:6]), 4).value
+        try:
+            return self.op_add_registers[op_add_code][operand_size]
+        except KeyError:
+            raise OpcodeError(f"No {operand_size}-byte register has op-add code {op_add_code}.") from None
+
+    def decode_op_add_primary(self, op_add: int, operand_size: int) -> tuple[str, str | Register]:
+        # bits 0-2: secondary register, bits 3-5: primary register, bits 6-7: indirection
+        if op_add >> 6 == 3:
+            return "special", ("null", "given_literal", None, None, "given_address", None, None, None)[op_add >> 3 & 7]
+        elif op_add >> 6 == 1:
+            return "memory", self.sized_op_add_register(op_add >> 3 & 7, 4)
         else:
-            return "register", self.sized_op_add_register(int(op_add[3:6]), operand_size).pointer
+            return "register", self.sized_op_add_register(op_add >> 3 & 7, operand_size)
 
-    def op_add_secondary(self, op_add: Byte, operand_size: int) -> tuple[str, str | int]:
-        if op_add[6:8] == 2:
-            return "memory", self.sized_op_add_register(int(op_add[0:3]), 4).value
+    def decode_op_add_secondary(self, op_add: int, operand_size: int) -> tuple[str, Register]:
+        if op_add >> 6 == 2:
+            return "memory", self.sized_op_add_register(op_add & 7, 4)
         else:
-            return "register", self.sized_op_add_register(int(op_add[0:3]), operand_size).pointer
+            return "register", self.sized_op_add_register(op_add & 7, operand_size)
+
+    def op_add_primary(self, op_add: Byte, operand_size: int) -> tuple[str, str | int | Register]:
+        op_type, op_value = self.op_add_primary_table[op_add.value][operand_size]
+        if op_type == "memory":
+            return op_type, op_value.value
+        return op_type, op_value
+
+    def op_add_secondary(self, op_add: Byte, operand_size: int) -> tuple[str, int | Register]:
+        op_type, op_value = self.op_add_secondary_table[op_add.value][operand_size]
+        if op_type == "memory":
+            return op_type, op_value.value
+        return op_type, op_value
 
     def read_op_add(self, op_add: Byte, which: str, operand_size: int) -> Byte | ByteArray:
         if which == "s":
@@ -189,19 +413,20 @@ class Machine:
                     return 0
                 raise ValueError("Cannot read special operands with read_op_add().")
         if src_type == "register":
-            return self.get_register(src_value).bytes[:operand_size]
+            return src_value[:operand_size]
         elif src_type == "memory":
             return self.memory.read(src_value, operand_size)
 
-    def write_op_add(self, op_add: Byte, which: str, data: ByteArray):
+    def write_op_add(self, op_add: Byte, which: str, data: ByteArray | Byte, operand_size: int = 0):
+        operand_size = operand_size or len(data)  # a lone Byte has to pass its size, as its len() counts bits
         if which == "s":
-            dest_type, dest_value = self.op_add_secondary(op_add, operand_size=len(data))
+            dest_type, dest_value = self.op_add_secondary(op_add, operand_size)
         else:  # which == "p"
-            dest_type, dest_value = self.op_add_primary(op_add, operand_size=len(data))
+            dest_type, dest_value = self.op_add_primary(op_add, operand_size)
             if dest_type == "special":
                 raise ValueError("Cannot write to special operands with write_op_add().")
         if dest_type == "register":
-            self.write_to_register(dest_value, data)
+            self.write_register(dest_value, data)
         elif dest_type == "memory":
             self.memory.write_at(dest_value, data)
 
@@ -222,49 +447,20 @@ class Machine:
         else:
             return self.read_op_add(instruction[1], "p", operand_size)
 
-    def op_add_givens_length(self, op_add: Byte, operand_size: int):
-        op_type, op_value = self.op_add_primary(op_add, operand_size)
-        if op_type == "special":
-            if op_value == "given_literal":
-                return operand_size
-            elif op_value == "given_address":
-                return 2
-            elif op_value == "null":
-                return 0
-        return 0
+    @staticmethod
+    def op_add_givens_length(op_add: Byte, operand_size: int):
+        return givens_length(op_add.value, operand_size)
 
     @staticmethod
     def uses_full_op_add(opcode: int | Byte):
-        if isinstance(opcode, int):
-            opcode = Byte(opcode)
-        if opcode[1:3] == 0 and int(opcode[4:8]) in (3, 4, 6, 7, 10):  # mirrors physical implementation
-            return True
-        if opcode[4:8] == 11:
-            return True
-        return False
-
-    def instruction_length(self, instruction: ByteArray):
-        ret = 0
-        if instruction[0][5:] == 6:  # conditionals
-            ret += 1
-            instruction = instruction[1:]
-        if self.uses_full_op_add(instruction[0]):
-            ret += self.op_add_givens_length(instruction[1], 4 if instruction[0][0] else 1)
-        return ret + opcodes[instruction.opcode].base_length
+        return full_op_add_table[int(opcode)]
+
+    @staticmethod
+    def instruction_length(instruction: ByteArray):
+        return encoded_length(bytes(instruction))
 
     def check_condition(self, mnemonic: str) -> bool:
-        if mnemonic in ("IFZ", "IFNZ"):
-            return self.get_flag("Z") == (mnemonic == "IFZ")
-        if mnemonic in ("IFN", "IFNN"):
-            return self.get_flag("N") == (mnemonic == "IFN")
-        if mnemonic == "IFGT":
-            return not self.get_flag("N") and not self.get_flag("Z")
-        if mnemonic == "IFLT":
-            return self.get_flag("N") and not self.get_flag("Z")
-        if mnemonic == "IFGTE":
-            return not self.get_flag("N") or self.get_flag("Z")
-        if mnemonic == "IFLTE":
-            return self.get_flag("N") or self.get_flag("Z")
+        return condition_holds(mnemonic, self.get_flag(FLAG_Z), self.get_flag(FLAG_N))
 
     @staticmethod
     def shift(data: ByteArray, n: int, mode: str = "l") -> ByteArray:
@@ -284,214 +480,281 @@ class Machine:
 
         This function is an extreme abstraction of the process, obviously."""
 
-        if raw_instruction[0][5:] == 6:  # conditionals
-            if not self.check_condition(raw_instruction.mnemonic):
+        if raw_instruction.opcode >> 5 == 6:  # conditionals
+            if not condition_table[raw_instruction.opcode << 3 | self.fl_register.data[0] & 7]:
                 return
             instruction = raw_instruction[1:]
         else:
             instruction = raw_instruction
 
-        operation = instruction[0]
-        mnemonic = instruction.mnemonic
-        core = mnemonic.split("-")[0]
-        suffix = mnemonic.split("-")[1] if "-" in mnemonic else ""
+        opcode = instruction.opcode
+        self.handlers[opcode](instruction, raw_instruction, decode_table[opcode])
 
-        if core == "PUSH":
-            operand_size = 4 if suffix[1] == "W" else 1
-            content = self.get_op_add_primary(instruction, operand_size)
-            self.memory.write_at(self.get_register("SP").value, content, operand_size)
-            self.increment_reg("SP", -operand_size)
-
-        elif core == "POP":
-            operand_size = 4 if suffix[0] == "W" else 1
-            self.write_to_register(instruction[1], self.read_stack(operand_size))
-            self.increment_reg("SP", operand_size)
-
-        elif core == "MOV":
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # op-add
-                content = self.get_op_add_primary(instruction, operand_size)
-                self.write_op_add(instruction[1], "s", content)
-            elif operation[1:3] == 1:  # lit -> indirect
-                content = instruction[2:2+operand_size]
-                self.write_op_add(instruction[1], "s", content)
-            elif operation[1:3] == 2:  # lit -> memory
-                content = instruction[3:3+operand_size]
-                self.memory.write_at(instruction[1:3], content)
-
-        elif core in ("ADD", "SUB"):
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # op-add
-                a = self.get_op_add_primary(instruction, operand_size).signed_int() * (-1 if core == "SUB" else 1)
-                b = self.read_op_add(instruction[1], "s", operand_size).signed_int()
-                self.write_op_add(instruction[1], "s", ByteArray(size=operand_size, data=a + b))
-            elif operation[1:3] == 1:  # lit -> indirect
-                a = self.read_op_add(instruction[1], "s", operand_size).signed_int() * (-1 if core == "SUB" else 1)
-                b = instruction[2:2+operand_size].signed_int()
-                self.write_op_add(instruction[1], "s", ByteArray(size=operand_size, data=a + b))
-            elif operation[1:3] == 2:  # lit -> memory
-                a = self.memory.read(instruction[1:3], operand_size).signed_int() * (-1 if core == "SUB" else 1)
-                b = instruction[3:3+operand_size].signed_int()
-                self.memory.write_at(instruction[1:3], ByteArray(size=operand_size, data=a + b))
-            else:
-                return
-
-            self.flag_condition("Z", a + b == 0)
-            if core == "ADD":
-                self.flag_condition("C", a + b > 2 ** (operand_size * 8))
-            if core == "SUB":
-                self.flag_condition("N", a + b < 0)
-
-        elif core == "CMP":
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # op-add
-                a = self.get_op_add_primary(instruction, operand_size).signed_int()
-                b = self.read_op_add(instruction[1], "s", operand_size).signed_int()
-            elif operation[1:3] == 1:  # lit -> indirect
-                a = self.read_op_add(instruction[1], "s", operand_size).signed_int()
-                b = instruction[2:2+operand_size].signed_int()
-            elif operation[1:3] == 2:  # lit -> memory
-                a = self.memory.read(instruction[1:3], operand_size).signed_int()
-                b = instruction[3:3+operand_size].signed_int()
-            else:
-                return
-
-            self.flag_condition("Z", a == b)
-            self.flag_condition("N", a < b)
-
-        elif core in ("AND", "OR", "XOR"):
-            func = (lambda x, y: x & y) if core == "AND" else (lambda x, y: x | y) if core == "OR" \
-                else (lambda x, y: x ^ y)
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # op-add
-                a = self.get_op_add_primary(instruction, operand_size)
-                b = self.read_op_add(instruction[1], "s", operand_size)
-                self.write_op_add(instruction[1], "s", ByteArray(size=operand_size, data=func(a, b)))
-            elif operation[1:3] == 1:  # lit -> indirect
-                a = self.read_op_add(instruction[1], "s", operand_size)
-                b = instruction[2:2+operand_size]
-                self.write_op_add(instruction[1], "s", ByteArray(size=operand_size, data=func(a, b)))
-            elif operation[1:3] == 2:  # lit -> memory
-                a = self.memory.read(instruction[1:3], operand_size)
-                b = instruction[3:3+operand_size]
-                self.memory.write_at(instruction[1:3], func(a, b), operand_size)
-            else:
-                return
+    def execute_nop(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        pass
 
-            self.flag_condition("Z", func(a, b) == 0)
-
-        elif core == "NOT":
-            operand_size = 4 if operation[0] else 1
-            source = self.get_op_add_primary(instruction, operand_size)
-            self.write_op_add(instruction[1], "s", -source)
-
-        elif core in ("LSH", "RSH"):
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # register or indirect
-                content = self.get_op_add_primary(instruction, operand_size)
-                literal = instruction[2]
-                shift = int(literal[0:5]) * (-1 if core == "RSH" else 1)
-                mode = "a" if literal[6:8] == 1 else "r" if literal[6:8] == 2 else "l"
-                self.write_op_add(instruction[1], "p", self.shift(content, shift, mode))
-            elif operation[1:3] == 1:  # memory address
-                content = self.memory.read(instruction[1:3], operand_size)
-                literal = instruction[3]
-                shift = int(literal[0:5]) * (-1 if core == "RSH" else 1)
-                mode = "a" if literal[6:8] == 1 else "r" if literal[6:8] == 2 else "l"
-                self.memory.write_at(instruction[1:3], self.shift(content, shift, mode), operand_size)
-            else:
-                return
+    def execute_undefined(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        raise OpcodeError(f"Undefined opcode {instruction.opcode:02X} encountered "
+                          f"at position {self.instruction_pointer}.")
 
-            self.flag_condition("Z", self.shift(content, shift, mode) == 0)
-
-        elif core == "BIT":
-            content = self.get_op_add_primary(instruction, 1)
-            bit = int(instruction[1][0:3])
-            self.flag_condition("Z", content[0][bit])
-
-        elif core == "REFBIT":
-            content = self.read_op_add(instruction[1], "s", 1)
-            bit = int(self.read_op_add(instruction[1], "p", 1)[0][0:3])
-            self.flag_condition("Z", content[0][bit])
-
-        elif core == "BBIT":
-            content = self.get_op_add_primary(instruction, 4)
-            byte = content[int(instruction[0][0:2])]
-            bit = int(instruction[1][0:3])
-            self.flag_condition("Z", byte[bit])
-
-        elif core == "BYTE":
-            content = self.get_op_add_primary(instruction, 4)
-            byte = content[int(instruction[0][0:2])]
-            self.write_op_add(instruction[1], "s", byte)
-
-        elif core == "OUT":
-            operand_size = 4 if operation[0] else 1
-            if operation[1:3] == 0:  # register
-                content = self.read_op_add(instruction[1], "p", operand_size).ascii()
-            elif operation[1:3] == 1:  # memory
-                content = self.memory.read(instruction[1:3], operand_size).ascii()
-            elif operation[1:3] == 2:  # literal
-                content = instruction[1:1+operand_size].ascii()
-            else:
+    def execute_push(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        sp = self.sp_register.value
+        op_type, source = self.op_add_primary_table[instruction.value >> 8 & 255][operand_size]
+        if op_type == "register":  # copied straight from the register's bytes
+            self.memory.write_at(sp, source.data, operand_size)
+        else:
+            self.memory.write_at(sp, self.get_op_add_primary(instruction, operand_size), operand_size)
+        self.write_register(self.sp_register, sp - operand_size)
+
+    def execute_pop(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        self.write_to_register(instruction[1], self.read_stack(operand_size))
+        self.increment_reg(self.sp_register, operand_size)
+
+    def execute_mov(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        if decoded.mode == 0:  # op-add
+            op_add = instruction.value >> 8 & 255
+            if op_add >> 6 == 0:  # register -> register, the common case, skips the generic op-add plumbing
+                registers = self.op_add_registers
+                self.write_register(registers[op_add & 7][operand_size], registers[op_add >> 3 & 7][operand_size].data)
                 return
+            content = self.get_op_add_primary(instruction, operand_size)
+            self.write_op_add(instruction[1], "s", content)
+        elif decoded.mode == 1:  # lit -> indirect
+            content = instruction[2:2+operand_size]
+            self.write_op_add(instruction[1], "s", content)
+        elif decoded.mode == 2:  # lit -> memory
+            content = instruction[3:3+operand_size]
+            self.memory.write_at(instruction[1:3], content)
+
+    def fetch_arithmetic_operands(self, instruction: ByteArray, decoded: DecodedOpcode):
+        """Reads the two signed operands of an arithmetic, compare or logic instruction,
+        according to its addressing mode.
+
+        Returns them along with a function that writes a result back to the instruction's destination,
+        or None if the addressing mode is invalid."""
+        if decoded.mode == 0:
+            return self.fetch_op_add_operands(instruction, decoded.operand_size)
+        elif decoded.mode == 1:
+            return self.fetch_indirect_operands(instruction, decoded.operand_size)
+        elif decoded.mode == 2:
+            return self.fetch_memory_operands(instruction, decoded.operand_size)
+
+    # the fetchers below pull op-add bytes, addresses and literals out of the instruction's value with shifts,
+    # rather than slicing them out as Byte and ByteArray objects
+
+    def fetch_destination(self, op_add: int, operand_size: int):
+        dest_type, dest = self.op_add_secondary_table[op_add][operand_size]
+        if dest_type == "register":
+            return int.from_bytes(dest.data[:operand_size], "little", signed=True), \
+                lambda v: self.write_register(dest, v)
+        address = dest.value
+        return self.memory.read_int(address, operand_size, signed=True), \
+            lambda v: self.memory.write_int(address, operand_size, v)
+
+    def fetch_op_add_operands(self, instruction: ByteArray, operand_size: int):
+        op_add = instruction.value >> 8 & 255
+        secondary, commit = self.fetch_destination(op_add, operand_size)
+        src_type, src = self.op_add_primary_table[op_add][operand_size]
+        if src_type == "register":
+            primary = int.from_bytes(src.data[:operand_size], "little", signed=True)
+        elif src_type == "memory":
+            primary = self.memory.read_int(src.value, operand_size, signed=True)
+        else:
+            primary = self.get_op_add_primary(instruction, operand_size).signed_int()
+        return primary, secondary, commit
+
+    def fetch_indirect_operands(self, instruction: ByteArray, operand_size: int):
+        value = instruction.value
+        secondary, commit = self.fetch_destination(value >> 8 & 255, operand_size)
+        literal = value >> 16 & ((1 << (operand_size * 8)) - 1)
+        return secondary, signed_value(literal, operand_size * 8), commit
+
+    def fetch_memory_operands(self, instruction: ByteArray, operand_size: int):
+        value = instruction.value
+        address = value >> 8 & 0xFFFF
+        literal = value >> 24 & ((1 << (operand_size * 8)) - 1)
+        return self.memory.read_int(address, operand_size, signed=True), signed_value(literal, operand_size * 8), \
+            lambda v: self.memory.write_int(address, operand_size, v)
+
+    def execute_add(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        if not (operands := self.fetch_arithmetic_operands(instruction, decoded)):
+            return
+        a, b, commit = operands
+        result = a + b
+        commit(result)
+
+        flags = self.fl_register.data  # Z and C are blended into FL in one write
+        flags[0] = flags[0] & ~(1 << FLAG_Z | 1 << FLAG_C) | (result == 0) << FLAG_Z \
+            | (result > 1 << (decoded.operand_size * 8)) << FLAG_C
+
+    def execute_sub(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        if not (operands := self.fetch_arithmetic_operands(instruction, decoded)):
+            return
+        a, b, commit = operands
+        result = b - a
+        commit(result)
+
+        flags = self.fl_register.data  # Z and N are blended into FL in one write
+        flags[0] = flags[0] & ~(1 << FLAG_Z | 1 << FLAG_N) | (result == 0) << FLAG_Z | (result < 0) << FLAG_N
+
+    def execute_compare(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        if not (operands := self.fetch_arithmetic_operands(instruction, decoded)):
+            return
+        a, b, _ = operands
+
+        flags = self.fl_register.data
+        flags[0] = flags[0] & ~(1 << FLAG_Z | 1 << FLAG_N) | (a == b) << FLAG_Z | (a < b) << FLAG_N
+
+    def execute_logic(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        if not (operands := self.fetch_arithmetic_operands(instruction, decoded)):
+            return
+        a, b, commit = operands
+        # bitwise ops on the sign-extended operands give the right bits once masked back to the operand size
+        result = logic_functions[decoded.core](a, b) & ((1 << (decoded.operand_size * 8)) - 1)
+        commit(result)
+
+        flags = self.fl_register.data
+        flags[0] = flags[0] & ~(1 << FLAG_Z) | (result == 0) << FLAG_Z
+
+    def execute_not(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        source = self.get_op_add_primary(instruction, operand_size)
+        self.write_op_add(instruction[1], "s", -source)
+
+    def execute_shift(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        if decoded.mode == 0:  # register or indirect
+            content = self.get_op_add_primary(instruction, operand_size)
+            literal = instruction[2].value
+            shift = (literal & 31) * (-1 if decoded.core == "RSH" else 1)
+            mode = "a" if literal >> 6 == 1 else "r" if literal >> 6 == 2 else "l"
+            self.write_op_add(instruction[1], "p", self.shift(content, shift, mode))
+        elif decoded.mode == 1:  # memory address
+            content = self.memory.read(instruction[1:3], operand_size)
+            literal = instruction[3].value
+            shift = (literal & 31) * (-1 if decoded.core == "RSH" else 1)
+            mode = "a" if literal >> 6 == 1 else "r" if literal >> 6 == 2 else "l"
+            self.memory.write_at(instruction[1:3], self.shift(content, shift, mode), operand_size)
+        else:
+            return
+
+        self.flag_condition(FLAG_Z, self.shift(content, shift, mode) == 0)
+
+    def execute_bit(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        content = self.get_op_add_primary(instruction, 1)
+        bit = instruction[1].value & 7
+        self.flag_condition(FLAG_Z, content[0][bit])
+
+    def execute_refbit(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        content = self.read_op_add(instruction[1], "s", 1)
+        bit = self.read_op_add(instruction[1], "p", 1)[0].value & 7
+        self.flag_condition(FLAG_Z, content[0][bit])
+
+    def execute_bbit(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        content = self.get_op_add_primary(instruction, 4)
+        byte = content[instruction.opcode & 3]
+        bit = instruction[1].value & 7
+        self.flag_condition(FLAG_Z, byte[bit])
+
+    def execute_byte(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        content = self.get_op_add_primary(instruction, 4)
+        byte = content[instruction.opcode & 3]
+        self.write_op_add(instruction[1], "s", byte, 1)
+
+    def execute_out(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        operand_size = decoded.operand_size
+        if decoded.mode == 0:  # register
+            content = self.read_op_add(instruction[1], "p", operand_size).ascii()
+        elif decoded.mode == 1:  # memory
+            content = self.memory.read(instruction[1:3], operand_size).ascii()
+        elif decoded.mode == 2:  # literal
+            content = instruction[1:1+operand_size].ascii()
+        else:
+            return
 
-            stdout.write(content.replace(chr(0), ""))
-
-        elif core == "JMP":
-            self.write_to_register("IP", instruction[1:3])
-            self.set_flag("H")
-
-        elif core == "JREL":
-            self.increment_reg("IP", instruction[1].signed_int())
-            self.set_flag("H")
+        stdout.write(content.replace(chr(0), ""))
 
-        elif core in ("CALL", "LOCAL"):
-            if suffix == "MEM":
-                dest = instruction[1:3]
-            else:
-                dest = self.read_op_add(instruction[1], "p", 2)
-            for reg in (self.save_on_local if core == "LOCAL" else self.save_on_call):
-                self.push(self.get_register(reg).bytes)
-            self.increment_reg("IP", self.instruction_length(raw_instruction))
-            self.move_register("IP", "RI")
-            self.move_register("SP", "RS")
-            self.write_to_register("IP", dest)
-
-            self.set_flag("H")
-            self.flag_condition("L", core == "LOCAL")
-
-        elif core == "RET":
-            self.move_register("RS", "SP")
-            self.move_register("RI", "IP")
-            for reg_name in (self.save_on_local if self.get_flag("L") else self.save_on_call).__reversed__():
-                reg = self.get_register(reg_name)
-                reg.write(self.pop(reg.size))
-            self.set_flag("H")
+    def execute_jump(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        self.write_register(self.ip_register, instruction.value >> 8 & 0xFFFF)
+        self.fl_register.data[0] |= 1 << FLAG_H
 
-        elif core == "HLT":
-            self.halted = True
+    def execute_relative_jump(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        self.increment_reg(self.ip_register, signed_value(instruction.value >> 8 & 255, 8))
+        self.fl_register.data[0] |= 1 << FLAG_H
 
-    def run(self, address: int, step_by_step: bool = False, silent: bool = False):
-        """Runs a program starting at the given memory address."""
-        self.write_to_register("IP", address)
+    def execute_call(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        if decoded.suffix == "MEM":
+            dest = instruction[1:3]
+        else:
+            dest = self.read_op_add(instruction[1], "p", 2)
+        self.push_registers(self.local_saved_registers if decoded.core == "LOCAL" else self.call_saved_registers)
+        self.increment_reg(self.ip_register, self.instruction_length(raw_instruction))
+        self.write_register(self.ri_register, self.ip_register.data)
+        self.write_register(self.rs_register, self.sp_register.data)
+        self.write_register(self.ip_register, dest)
+
+        flags = self.fl_register.data  # H and L are blended into FL in one write
+        flags[0] = flags[0] & ~(1 << FLAG_L) | 1 << FLAG_H | (decoded.core == "LOCAL") << FLAG_L
+
+    def execute_return(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        self.write_register(self.sp_register, self.rs_register.data)
+        self.write_register(self.ip_register, self.ri_register.data)
+        self.pop_registers(self.local_saved_registers if self.get_flag(FLAG_L) else self.call_saved_registers)
+        self.fl_register.data[0] |= 1 << FLAG_H
+
+    def execute_halt(self, instruction: ByteArray, raw_instruction: ByteArray, decoded: DecodedOpcode):
+        self.halted = True
+
+    def run(self, address: int, step_by_step: bool = False, silent: bool | None = None, trace_every: int = 1):
+        """Runs a program starting at the given memory address.
+        Unless told otherwise, the per-step trace is only printed when stepping through the program,
+        and then only for every trace_every-th instruction."""
+        if trace_every < 1:
+            raise ValueError(f"trace_every must be at least 1, not {trace_every}.")
+        if silent is None:
+            silent = not step_by_step
+        ip_register = self.ip_register
+        self.write_register(ip_register, address)
+        # the loop below runs once per emulated instruction, so everything it touches is bound locally
+        flags = self.fl_register.data
+        memory = self.memory.data
+        execute = self.execute_instruction
+        handlers = self.handlers
+        instruction_cache = self.instruction_cache
+        write_register = self.write_register
         if not silent:
-            print(f"Initial state:\n\n{self.state_map}")
+            print(f"Initial state:\n\n{self.state_map()}")
             if step_by_step:
                 _ = input("This machine is operating in step-by-step mode. Press Enter to advance by one step.")
         while True:
-            next_instruction = self.memory.read(self.instruction_pointer, 16)
-            if not silent:
-                print(f"Instruction {self.operation_counter}: {next_instruction.hex}\n")
-            self.execute_instruction(next_instruction)
+            ip = ip_register.value
+            cached = instruction_cache.get(ip)
+            if cached and memory[ip:ip + cached[0]] == cached[1]:  # still valid unless the code was overwritten
+                length, _, next_instruction = cached
+            else:
+                length = encoded_length(memory, ip)  # fetch only the bytes the instruction actually spans
+                raw = bytes(memory[ip:ip + length])
+                next_instruction = ByteArray.from_buffer(raw)
+                instruction_cache[ip] = length, raw, next_instruction
+            traced = not silent and self.operation_counter % trace_every == 0
+            if traced:
+                print(f"Instruction {self.operation_counter}: {memory[ip:ip + 16].hex(' ').upper()}\n")
+            opcode = memory[ip]
+            if opcode >> 5 == 6:  # conditionals still go through execute_instruction() to check and strip the prefix
+                execute(next_instruction)
+            else:
+                handlers[opcode](next_instruction, next_instruction, decode_table[opcode])
             if self.halted:
                 break
-            if not self.get_flag("H"):
-                self.increment_reg("IP", self.instruction_length(next_instruction))
+            if not flags[0] >> FLAG_H & 1:  # H is set by instructions that move IP themselves
+                write_register(ip_register, ip_register.value + length)
             else:
-                self.clear_flag("H")
-            if not silent:
-                print(self.state_map)
+                flags[0] &= ~(1 << FLAG_H)
+            if traced:
+                print(self.state_map())
                 if step_by_step:
                     _ = input()
             self.operation_counter += 1
@@ -500,14 +763,9 @@ class Machine:
         else:
             print("[SYS] System halted.")
 
-    def execute_file(self, path: str, step_by_step: bool = False, silent: bool = False):
+    def execute_file(self, path: str, step_by_step: bool = False, silent: bool | None = None, trace_every: int = 1):
         """Executes a raw bytecode file with the given path."""
         print(f"[SYS] Executing file...")
-        with open(path, "rb") as fp:
-            # write file to memory in pages to prevent massive list or I/O operations
-            page = 0
-            page_length = 4096
-            while bts := fp.read(page_length):
-                self.memory.write_at(page * page_length, bts, page_length)
-                page += 1
-        self.run(0, step_by_step, silent)
+        with open(path, "rb") as fp, memoryview(self.memory.data) as view:
+            fp.readinto(view)  # the file is read straight into memory; anything past the end of memory is dropped
+        self.run(0, step_by_step, silent, trace_every)